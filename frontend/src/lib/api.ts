@@ -2,7 +2,12 @@
  * API client for communicating with the APalysis backend (torchview-based).
  */
 
-import type { TorchviewGraphData, TorchviewNode, ModelSummary } from './types';
+import type {
+	TorchviewGraphData,
+	TorchviewEdgeColumns,
+	TorchviewNode,
+	ModelSummary
+} from './types';
 
 // API base URL - in production this will be same origin
 const API_BASE = '/api';
@@ -29,9 +34,20 @@ async function fetchJson<T>(url: string, options?: RequestInit): Promise<T> {
 
 /**
  * Get the torchview graph data.
+ *
+ * Edges are requested in columnar form, which is much smaller on the wire,
+ * and unpacked back into edge objects here.
  */
 export async function getGraph(): Promise<TorchviewGraphData> {
-	return fetchJson<TorchviewGraphData>(`${API_BASE}/graph`);
+	const data = await fetchJson<
+		Omit<TorchviewGraphData, 'edges'> & { edges: TorchviewEdgeColumns }
+	>(`${API_BASE}/graph?edges=columnar`);
+	const { source, target, count } = data.edges;
+
+	return {
+		...data,
+		edges: source.map((s, i) => ({ source: s, target: target[i], count: count[i] }))
+	};
 }
 
 /**
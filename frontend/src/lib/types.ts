@@ -34,6 +34,13 @@ export interface TorchviewEdge {
 	count: number;
 }
 
+/** Edges as parallel arrays, as sent with `?edges=columnar` */
+export interface TorchviewEdgeColumns {
+	source: string[];
+	target: string[];
+	count: number[];
+}
+
 /** Subgraph (module group) information */
 export interface Subgraph {
 	label: string;
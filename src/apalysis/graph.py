@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass, field, replace
+from itertools import pairwise
 from typing import TYPE_CHECKING, Any
 
+import orjson
+
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from apalysis.parser import ModelParser
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GraphNode:
     """A node in the visualization graph."""
 
@@ -25,7 +31,10 @@ class GraphNode:
     parent_id: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+        """Convert to dictionary for JSON serialization.
+
+        Depth and parent are left out; both follow from the hierarchy edges.
+        """
         return {
             "id": self.id,
             "label": self.label,
@@ -35,12 +44,10 @@ class GraphNode:
             "params": self.params,
             "hasChildren": self.has_children,
             "expanded": self.expanded,
-            "depth": self.depth,
-            "parentId": self.parent_id,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """An edge in the visualization graph."""
 
@@ -57,18 +64,89 @@ class GraphEdge:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphData:
     """The complete graph data for visualization."""
 
     nodes: list[GraphNode] = field(default_factory=list)
     edges: list[GraphEdge] = field(default_factory=list)
+    root_id: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        # Build the records inline rather than through per-element to_dict()
+        return {
+            "rootId": self.root_id,
+            "nodes": [
+                {
+                    "id": n.id,
+                    "label": n.label,
+                    "layerType": n.layer_type,
+                    "moduleClass": n.module_class,
+                    "numParameters": n.num_parameters,
+                    "params": n.params,
+                    "hasChildren": n.has_children,
+                    "expanded": n.expanded,
+                }
+                for n in self.nodes
+            ],
+            "edges": [
+                {"source": e.source, "target": e.target, "edgeType": e.edge_type}
+                for e in self.edges
+            ],
+        }
+
+    def to_columnar_dict(self) -> dict[str, Any]:
+        """Convert to a column-oriented dictionary for JSON serialization.
+
+        Every node and edge field becomes one array; the i-th entry of each
+        array belongs to the i-th node (or edge).
+        """
+        nodes = self.nodes
+        edges = self.edges
+        return {
+            "rootId": self.root_id,
+            "nodes": {
+                "id": [n.id for n in nodes],
+                "label": [n.label for n in nodes],
+                "layerType": [n.layer_type for n in nodes],
+                "moduleClass": [n.module_class for n in nodes],
+                "numParameters": [n.num_parameters for n in nodes],
+                "params": [n.params for n in nodes],
+                "hasChildren": [n.has_children for n in nodes],
+                "expanded": [n.expanded for n in nodes],
+            },
+            "edges": {
+                "source": [e.source for e in edges],
+                "target": [e.target for e in edges],
+                "edgeType": [e.edge_type for e in edges],
+            },
+        }
+
+    def serialize(self, columnar: bool = False) -> bytes:
+        """Serialize to JSON bytes ready to be sent as a response body."""
+        content = self.to_columnar_dict() if columnar else self.to_dict()
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@dataclass(slots=True)
+class GraphPatch:
+    """Changes to the visible graph caused by a single expand/collapse."""
+
+    added_nodes: list[GraphNode] = field(default_factory=list)
+    added_edges: list[GraphEdge] = field(default_factory=list)
+    removed_nodes: list[str] = field(default_factory=list)
+    updated_nodes: list[GraphNode] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
-            "nodes": [node.to_dict() for node in self.nodes],
-            "edges": [edge.to_dict() for edge in self.edges],
+            "added": {
+                "nodes": [node.to_dict() for node in self.added_nodes],
+                "edges": [edge.to_dict() for edge in self.added_edges],
+            },
+            "removed": self.removed_nodes,
+            "updated": [node.to_dict() for node in self.updated_nodes],
         }
 
 
@@ -83,30 +161,28 @@ class GraphBuilder:
     def __init__(self, parser: ModelParser):
         self.parser = parser
         self._expanded_nodes: set[str] = set()
+        self._details_cache: dict[str, dict[str, Any]] = {}
+        self._expandable_nodes: frozenset[str] | None = None
 
     def get_initial_graph(self) -> GraphData:
         """Get the initial graph with only the root node."""
-        root_layer = self.parser.layers.get(self.parser.root_id)
-        if root_layer is None:
+        parser = self.parser
+        root_node = parser.node_templates.get(parser.root_id)
+        if root_node is None:
             return GraphData()
 
-        root_node = GraphNode(
-            id=root_layer.id,
-            label=root_layer.label,
-            layer_type=root_layer.layer_type,
-            module_class=root_layer.module_class,
-            num_parameters=root_layer.num_parameters,
-            params=root_layer.params,
-            has_children=len(root_layer.children) > 0,
-            expanded=False,
-            depth=root_layer.depth,
-            parent_id=None,
-        )
-
-        return GraphData(nodes=[root_node], edges=[])
+        return GraphData(nodes=[root_node], edges=[], root_id=root_node.id)
 
     def get_full_graph(self) -> GraphData:
         """Get the full graph based on current expansion state."""
+        # Nothing expanded: only the root is visible
+        if not self._expanded_nodes:
+            return self.get_initial_graph()
+
+        # Everything expanded: every layer is visible
+        if self._expanded_nodes.issuperset(self._get_expandable_nodes()):
+            return self.get_fully_expanded_graph()
+
         visible_nodes: list[GraphNode] = []
         visible_edges: list[GraphEdge] = []
 
@@ -115,7 +191,55 @@ class GraphBuilder:
             self.parser.root_id, visible_nodes, visible_edges
         )
 
-        return GraphData(nodes=visible_nodes, edges=visible_edges)
+        return GraphData(
+            nodes=visible_nodes,
+            edges=visible_edges,
+            root_id=self.parser.root_id if visible_nodes else None,
+        )
+
+    def get_fully_expanded_graph(self) -> GraphData:
+        """Get the graph with every layer visible, without walking the tree."""
+        parser = self.parser
+        templates = parser.node_templates
+        expanded = self._expanded_nodes
+
+        # Layers are stored in pre-order, which matches the order of a
+        # traversal from the root
+        nodes = [
+            replace(node, expanded=True) if layer_id in expanded else node
+            for layer_id, node in templates.items()
+        ]
+
+        prev_sibling: dict[str, str] = {}
+        for layer in parser.layers.values():
+            for prev_child_id, child_id in pairwise(layer.children):
+                prev_sibling[child_id] = prev_child_id
+
+        edges: list[GraphEdge] = []
+        edges_append = edges.append
+        for node in templates.values():
+            if node.parent_id is None:
+                continue
+            edges_append(GraphEdge(node.parent_id, node.id, "hierarchy"))
+            prev_child_id = prev_sibling.get(node.id)
+            if prev_child_id is not None:
+                edges_append(GraphEdge(prev_child_id, node.id, "sequence"))
+
+        return GraphData(
+            nodes=nodes,
+            edges=edges,
+            root_id=parser.root_id if nodes else None,
+        )
+
+    def _get_expandable_nodes(self) -> frozenset[str]:
+        """Get the IDs of all layers that have children."""
+        if self._expandable_nodes is None:
+            self._expandable_nodes = frozenset(
+                layer_id
+                for layer_id, layer in self.parser.layers.items()
+                if layer.children
+            )
+        return self._expandable_nodes
 
     def _collect_visible_nodes(
         self,
@@ -123,58 +247,92 @@ class GraphBuilder:
         visible_nodes: list[GraphNode],
         visible_edges: list[GraphEdge],
     ) -> None:
-        """Recursively collect visible nodes based on expansion state."""
-        layer = self.parser.layers.get(layer_id)
-        if layer is None:
-            return
-
-        is_expanded = layer_id in self._expanded_nodes
-
-        # Add this node
-        node = GraphNode(
-            id=layer.id,
-            label=layer.label,
-            layer_type=layer.layer_type,
-            module_class=layer.module_class,
-            num_parameters=layer.num_parameters,
-            params=layer.params,
-            has_children=len(layer.children) > 0,
-            expanded=is_expanded,
-            depth=layer.depth,
-            parent_id=layer.parent_id,
+        """Collect visible nodes and edges based on expansion state."""
+        nodes_append = visible_nodes.append
+        edges_append = visible_edges.append
+
+        for kind, item in self._iter_visible(layer_id):
+            if kind == "node":
+                nodes_append(item)
+            else:
+                edges_append(item)
+
+    def _iter_visible(
+        self, layer_id: str
+    ) -> Iterator[tuple[str, GraphNode | GraphEdge]]:
+        """Yield ("node", GraphNode) and ("edge", GraphEdge) pairs.
+
+        Walks the hierarchy with an explicit stack so that collapsed
+        subtrees are never visited. Nodes and edges are produced in the
+        same pre-order as a recursive walk.
+        """
+        layers = self.parser.layers
+        templates = self.parser.node_templates
+        expanded = self._expanded_nodes
+
+        # Each entry is (layer_id, parent_id, previous_sibling_id)
+        stack: deque[tuple[str, str | None, str | None]] = deque(
+            [(layer_id, None, None)]
         )
-        visible_nodes.append(node)
-
-        # If expanded, add children and edges
-        if is_expanded and layer.children:
-            prev_child_id: str | None = None
-
-            for child_id in layer.children:
-                # Add edge from parent to first child (hierarchy edge)
-                visible_edges.append(
-                    GraphEdge(
-                        source=layer_id,
-                        target=child_id,
-                        edge_type="hierarchy",
-                    )
+
+        while stack:
+            current_id, parent_id, prev_sibling_id = stack.pop()
+
+            if parent_id is not None:
+                # Hierarchy edge from parent to child
+                yield "edge", GraphEdge(
+                    source=parent_id,
+                    target=current_id,
+                    edge_type="hierarchy",
                 )
 
-                # Add sequential edge between siblings
-                if prev_child_id is not None:
-                    visible_edges.append(
-                        GraphEdge(
-                            source=prev_child_id,
-                            target=child_id,
-                            edge_type="sequence",
-                        )
+                # Sequential edge between siblings
+                if prev_sibling_id is not None:
+                    yield "edge", GraphEdge(
+                        source=prev_sibling_id,
+                        target=current_id,
+                        edge_type="sequence",
                     )
 
-                # Recursively process children
-                self._collect_visible_nodes(
-                    child_id, visible_nodes, visible_edges
-                )
+            node = templates.get(current_id)
+            if node is None:
+                continue
+
+            is_expanded = current_id in expanded
+
+            # Templates are collapsed; copy only the nodes that are expanded
+            yield "node", replace(node, expanded=True) if is_expanded else node
+
+            # Only descend into expanded nodes; push children in reverse
+            # so they are popped in their original order
+            children = layers[current_id].children
+            if is_expanded and children:
+                for index in range(len(children) - 1, -1, -1):
+                    prev_child_id = children[index - 1] if index > 0 else None
+                    stack.append((children[index], current_id, prev_child_id))
+
+    def iter_full_graph_json(self) -> Iterator[bytes]:
+        """Stream the current graph as JSON chunks.
+
+        Produces the same document as ``get_full_graph().serialize()``
+        without materializing the node and edge lists. Nodes and edges
+        are emitted by two separate walks over the visible tree.
+        """
+        root_id = self.parser.root_id
+        option = orjson.OPT_NON_STR_KEYS
+
+        has_root = root_id in self.parser.node_templates
+        yield b'{"rootId":' + orjson.dumps(root_id if has_root else None)
 
-                prev_child_id = child_id
+        for section, wanted in ((b',"nodes":[', "node"), (b'],"edges":[', "edge")):
+            yield section
+            separator = b""
+            for kind, item in self._iter_visible(root_id):
+                if kind == wanted:
+                    yield separator + orjson.dumps(item.to_dict(), option=option)
+                    separator = b","
+
+        yield b"]}"
 
     def expand_node(self, node_id: str) -> GraphData:
         """Expand a node to show its children."""
@@ -185,6 +343,37 @@ class GraphBuilder:
         self._expanded_nodes.add(node_id)
         return self.get_full_graph()
 
+    def expand_node_incremental(self, node_id: str) -> GraphPatch:
+        """Expand a node and return only the part of the graph it reveals.
+
+        Expanding a node under a collapsed ancestor reveals nothing yet, so
+        the patch is empty.
+        """
+        expanded = self._expanded_nodes
+        layer = self.parser.layers.get(node_id)
+        if layer is None or not layer.children or node_id in expanded:
+            return GraphPatch()
+
+        expanded.add(node_id)
+        if not self._is_visible(node_id):
+            return GraphPatch()
+
+        # Walk only the newly visible subtree; its first node is node_id
+        subtree_nodes: list[GraphNode] = []
+        subtree_edges: list[GraphEdge] = []
+        self._collect_visible_nodes(node_id, subtree_nodes, subtree_edges)
+
+        return GraphPatch(
+            added_nodes=subtree_nodes[1:],
+            added_edges=subtree_edges,
+            updated_nodes=subtree_nodes[:1],
+        )
+
+    def expand_all(self) -> GraphData:
+        """Expand every node that has children."""
+        self._expanded_nodes = set(self._get_expandable_nodes())
+        return self.get_fully_expanded_graph()
+
     def collapse_node(self, node_id: str) -> GraphData:
         """Collapse a node to hide its children."""
         if node_id in self._expanded_nodes:
@@ -195,16 +384,48 @@ class GraphBuilder:
 
         return self.get_full_graph()
 
-    def _collapse_descendants(self, node_id: str) -> None:
-        """Recursively collapse all descendants of a node."""
-        layer = self.parser.layers.get(node_id)
-        if layer is None:
-            return
+    def collapse_node_incremental(self, node_id: str) -> GraphPatch:
+        """Collapse a node and return the IDs of the nodes it hides.
+
+        Edges touching the removed nodes are implicitly removed as well.
+        Collapsing a node under a collapsed ancestor hides nothing, so the
+        patch is empty.
+        """
+        expanded = self._expanded_nodes
+        if node_id not in expanded:
+            return GraphPatch()
+
+        if not self._is_visible(node_id):
+            expanded.remove(node_id)
+            self._collapse_descendants(node_id)
+            return GraphPatch()
+
+        # Everything below node_id that is currently visible disappears
+        subtree_nodes: list[GraphNode] = []
+        self._collect_visible_nodes(node_id, subtree_nodes, [])
+
+        expanded.remove(node_id)
+        self._collapse_descendants(node_id)
+
+        return GraphPatch(
+            removed_nodes=[node.id for node in subtree_nodes[1:]],
+            updated_nodes=[self.parser.node_templates[node_id]],
+        )
+
+    def _is_visible(self, node_id: str) -> bool:
+        """Check whether every ancestor of a node is expanded."""
+        layers = self.parser.layers
+        expanded = self._expanded_nodes
+        parent_id = layers[node_id].parent_id
+        while parent_id is not None:
+            if parent_id not in expanded:
+                return False
+            parent_id = layers[parent_id].parent_id
+        return True
 
-        for child_id in layer.children:
-            if child_id in self._expanded_nodes:
-                self._expanded_nodes.remove(child_id)
-            self._collapse_descendants(child_id)
+    def _collapse_descendants(self, node_id: str) -> None:
+        """Collapse all descendants of a node."""
+        self._expanded_nodes -= self.parser.descendants.get(node_id, frozenset())
 
     def toggle_node(self, node_id: str) -> GraphData:
         """Toggle the expansion state of a node."""
@@ -219,27 +440,32 @@ class GraphBuilder:
 
     def get_node_details(self, node_id: str) -> dict[str, Any] | None:
         """Get detailed information about a specific node."""
-        layer = self.parser.layers.get(node_id)
-        if layer is None:
-            return None
-
-        return {
-            "id": layer.id,
-            "name": layer.name,
-            "label": layer.label,
-            "layerType": layer.layer_type,
-            "moduleClass": layer.module_class,
-            "numParameters": layer.num_parameters,
-            "params": layer.params,
-            "hasChildren": len(layer.children) > 0,
-            "childCount": len(layer.children),
-            "children": layer.children,
-            "parentId": layer.parent_id,
-            "depth": layer.depth,
-            "inputShape": layer.input_shape,
-            "outputShape": layer.output_shape,
-            "expanded": node_id in self._expanded_nodes,
-        }
+        details = self._details_cache.get(node_id)
+        if details is None:
+            layer = self.parser.layers.get(node_id)
+            if layer is None:
+                return None
+
+            # Everything except the expansion state is fixed after parsing
+            details = {
+                "id": layer.id,
+                "name": layer.name,
+                "label": layer.label,
+                "layerType": layer.layer_type,
+                "moduleClass": layer.module_class,
+                "numParameters": layer.num_parameters,
+                "params": layer.params,
+                "hasChildren": len(layer.children) > 0,
+                "childCount": len(layer.children),
+                "children": layer.children,
+                "parentId": layer.parent_id,
+                "depth": layer.depth,
+                "inputShape": layer.input_shape,
+                "outputShape": layer.output_shape,
+            }
+            self._details_cache[node_id] = details
+
+        return {**details, "expanded": node_id in self._expanded_nodes}
 
     def get_expansion_state(self) -> list[str]:
         """Get the list of currently expanded node IDs."""
@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
+import copy
+import weakref
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 import torch
 from torchview import draw_graph
 
+from apalysis.graph import GraphNode
+
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
     import torch.nn as nn
 
+# Layer shapes extracted from TorchView, keyed by model identity, layer
+# configuration and sample input, so re-parsing the same model skips tracing.
+# Entries are evicted when their model is garbage-collected.
+_SHAPE_CACHE: dict[tuple[Any, ...], dict[str, tuple[Any, Any]]] = {}
+_SHAPE_CACHE_SIZE = 32
+
 
-@dataclass
+@dataclass(slots=True)
 class LayerInfo:
     """Information about a single layer in the model."""
 
@@ -26,10 +39,169 @@ class LayerInfo:
     children: list[str] = field(default_factory=list)
     parent_id: str | None = None
     depth: int = 0
+    subtree_parameters: int = 0
     input_shape: list[tuple[int, ...]] | None = None
     output_shape: list[tuple[int, ...]] | None = None
 
 
+# Map common layer class names to categories
+_LAYER_TYPES: dict[str, str] = {
+    "Linear": "Linear",
+    "Conv1d": "Conv",
+    "Conv2d": "Conv",
+    "Conv3d": "Conv",
+    "ConvTranspose1d": "Conv",
+    "ConvTranspose2d": "Conv",
+    "ConvTranspose3d": "Conv",
+    "BatchNorm1d": "Normalization",
+    "BatchNorm2d": "Normalization",
+    "BatchNorm3d": "Normalization",
+    "LayerNorm": "Normalization",
+    "GroupNorm": "Normalization",
+    "InstanceNorm1d": "Normalization",
+    "InstanceNorm2d": "Normalization",
+    "Dropout": "Dropout",
+    "Dropout2d": "Dropout",
+    "Dropout3d": "Dropout",
+    "ReLU": "Activation",
+    "LeakyReLU": "Activation",
+    "PReLU": "Activation",
+    "ELU": "Activation",
+    "SELU": "Activation",
+    "GELU": "Activation",
+    "Sigmoid": "Activation",
+    "Tanh": "Activation",
+    "Softmax": "Activation",
+    "LogSoftmax": "Activation",
+    "MaxPool1d": "Pooling",
+    "MaxPool2d": "Pooling",
+    "MaxPool3d": "Pooling",
+    "AvgPool1d": "Pooling",
+    "AvgPool2d": "Pooling",
+    "AvgPool3d": "Pooling",
+    "AdaptiveMaxPool1d": "Pooling",
+    "AdaptiveMaxPool2d": "Pooling",
+    "AdaptiveAvgPool1d": "Pooling",
+    "AdaptiveAvgPool2d": "Pooling",
+    "Flatten": "Reshape",
+    "Unflatten": "Reshape",
+    "LSTM": "Recurrent",
+    "GRU": "Recurrent",
+    "RNN": "Recurrent",
+    "Embedding": "Embedding",
+    "MultiheadAttention": "Attention",
+    "Sequential": "Container",
+    "ModuleList": "Container",
+    "ModuleDict": "Container",
+}
+
+
+def _no_params(module: nn.Module) -> dict[str, Any]:
+    """Fallback for layers without notable parameters."""
+    return {}
+
+
+def _linear_params(module: nn.Linear) -> dict[str, Any]:
+    """Extract parameters of a linear layer."""
+    return {
+        "in_features": module.in_features,
+        "out_features": module.out_features,
+        "bias": module.bias is not None,
+    }
+
+
+def _conv_params(module: nn.Conv1d | nn.Conv2d | nn.Conv3d) -> dict[str, Any]:
+    """Extract parameters of a convolution layer."""
+    return {
+        "in_channels": module.in_channels,
+        "out_channels": module.out_channels,
+        "kernel_size": module.kernel_size,
+        "stride": module.stride,
+        "padding": module.padding,
+        "bias": module.bias is not None,
+    }
+
+
+def _batch_norm_params(
+    module: nn.BatchNorm1d | nn.BatchNorm2d | nn.BatchNorm3d,
+) -> dict[str, Any]:
+    """Extract parameters of a batch normalization layer."""
+    return {
+        "num_features": module.num_features,
+        "eps": module.eps,
+        "momentum": module.momentum,
+    }
+
+
+def _layer_norm_params(module: nn.LayerNorm) -> dict[str, Any]:
+    """Extract parameters of a layer normalization layer."""
+    return {
+        "normalized_shape": list(module.normalized_shape),
+        "eps": module.eps,
+    }
+
+
+def _dropout_params(module: nn.Dropout | nn.Dropout2d) -> dict[str, Any]:
+    """Extract parameters of a dropout layer."""
+    return {"p": module.p}
+
+
+def _embedding_params(module: nn.Embedding) -> dict[str, Any]:
+    """Extract parameters of an embedding layer."""
+    return {
+        "num_embeddings": module.num_embeddings,
+        "embedding_dim": module.embedding_dim,
+    }
+
+
+def _attention_params(module: nn.MultiheadAttention) -> dict[str, Any]:
+    """Extract parameters of a multi-head attention layer."""
+    return {
+        "embed_dim": module.embed_dim,
+        "num_heads": module.num_heads,
+        "dropout": module.dropout,
+    }
+
+
+def _recurrent_params(module: nn.LSTM | nn.GRU) -> dict[str, Any]:
+    """Extract parameters of a recurrent layer."""
+    return {
+        "input_size": module.input_size,
+        "hidden_size": module.hidden_size,
+        "num_layers": module.num_layers,
+        "bidirectional": module.bidirectional,
+    }
+
+
+# Layers whose configuration determines the shape of a sample input
+_INPUT_HINT_TYPES = (
+    torch.nn.Linear,
+    torch.nn.Conv2d,
+    torch.nn.Conv1d,
+    torch.nn.Embedding,
+)
+
+
+# Parameter extractors keyed by exact layer class. Subclasses are resolved
+# with isinstance in table order and then cached here by their own type.
+_PARAM_EXTRACTORS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    torch.nn.Linear: _linear_params,
+    torch.nn.Conv1d: _conv_params,
+    torch.nn.Conv2d: _conv_params,
+    torch.nn.Conv3d: _conv_params,
+    torch.nn.BatchNorm1d: _batch_norm_params,
+    torch.nn.BatchNorm2d: _batch_norm_params,
+    torch.nn.BatchNorm3d: _batch_norm_params,
+    torch.nn.LayerNorm: _layer_norm_params,
+    torch.nn.Dropout: _dropout_params,
+    torch.nn.Dropout2d: _dropout_params,
+    torch.nn.Embedding: _embedding_params,
+    torch.nn.MultiheadAttention: _attention_params,
+    torch.nn.LSTM: _recurrent_params,
+    torch.nn.GRU: _recurrent_params,
+}
+
+
 class ModelParser:
     """
     Parse a PyTorch model into a hierarchical structure.
@@ -38,30 +210,44 @@ class ModelParser:
     hierarchical tree based on module nesting.
     """
 
-    def __init__(self, model: nn.Module, model_name: str = "model"):
+    def __init__(
+        self,
+        model: nn.Module,
+        model_name: str = "model",
+        show_module_functions: bool = False,
+    ):
         self.model = model
         self.model_name = model_name
+        self.show_module_functions = show_module_functions
         self.layers: dict[str, LayerInfo] = {}
         self.root_id: str = model_name
+        self.node_templates: dict[str, GraphNode] = {}
+        self.descendants: dict[str, frozenset[str]] = {}
         self._computation_graph = None
+        self._first_input_hint: nn.Module | None = None
+        self._total_parameters: int | None = None
 
     def parse(self) -> None:
         """Parse the model and build the hierarchical structure."""
         self._build_hierarchy_from_modules()
+        self._build_node_templates()
+        self._build_descendant_index()
         self._extract_computation_graph()
 
     def _build_hierarchy_from_modules(self) -> None:
         """Build hierarchy from PyTorch module structure."""
-        # Create root node for the model
-        total_params = sum(p.numel() for p in self.model.parameters())
+        layers = self.layers
+        root_id = self.root_id
 
-        self.layers[self.root_id] = LayerInfo(
-            id=self.root_id,
+        # Create root node for the model; its parameter count is filled in
+        # once the subtree totals are known
+        layers[root_id] = LayerInfo(
+            id=root_id,
             name=self.model_name,
             label=self.model_name,
             layer_type="Module",
             module_class=type(self.model).__name__,
-            num_parameters=total_params,
+            num_parameters=0,
             params={},
             children=[],
             parent_id=None,
@@ -69,27 +255,48 @@ class ModelParser:
         )
 
         # Track parent-child relationships
-        module_to_id: dict[int, str] = {id(self.model): self.root_id}
+        module_to_id: dict[int, str] = {id(self.model): root_id}
+
+        # Group every parameter under its owning module in a single walk
+        own_params: defaultdict[str, list[torch.Tensor]] = defaultdict(list)
+        for param_name, param in self.model.named_parameters(remove_duplicate=False):
+            module_name, _, _ = param_name.rpartition(".")
+            own_params[module_name].append(param)
+
+        # Shared parameters are only counted towards the first owning
+        # module's subtree, matching model.parameters()
+        seen_params: set[int] = set()
+
+        # First layer that tells us what a sample input should look like
+        self._first_input_hint = None
 
         # Iterate through all named modules
         for name, module in self.model.named_modules():
+            if self._first_input_hint is None and isinstance(
+                module, _INPUT_HINT_TYPES
+            ):
+                self._first_input_hint = module
+
             if name == "":
+                layers[root_id].subtree_parameters = (
+                    self._count_parameters(own_params.get(name, ()), seen_params)[1]
+                )
                 continue
 
             # Build the full path ID
-            layer_id = f"{self.root_id}.{name}"
+            layer_id = f"{root_id}.{name}"
 
             # Find parent ID
             parts = name.split(".")
             if len(parts) == 1:
-                parent_id = self.root_id
+                parent_id = root_id
             else:
                 parent_name = ".".join(parts[:-1])
-                parent_id = f"{self.root_id}.{parent_name}"
+                parent_id = f"{root_id}.{parent_name}"
 
             # Get module info
-            num_params = sum(
-                p.numel() for p in module.parameters(recurse=False)
+            num_params, unique_params = self._count_parameters(
+                own_params.get(name, ()), seen_params
             )
             layer_type = self._get_layer_type(module)
             module_class = type(module).__name__
@@ -98,7 +305,7 @@ class ModelParser:
             params = self._extract_layer_params(module)
 
             # Create layer info
-            self.layers[layer_id] = LayerInfo(
+            layers[layer_id] = LayerInfo(
                 id=layer_id,
                 name=parts[-1],
                 label=parts[-1],
@@ -109,14 +316,84 @@ class ModelParser:
                 children=[],
                 parent_id=parent_id,
                 depth=len(parts),
+                subtree_parameters=unique_params,
             )
 
             # Add to parent's children
-            if parent_id in self.layers:
-                self.layers[parent_id].children.append(layer_id)
+            parent = layers.get(parent_id)
+            if parent is not None:
+                parent.children.append(layer_id)
 
             module_to_id[id(module)] = layer_id
 
+        # Accumulate subtree totals bottom-up: named_modules() is pre-order,
+        # so walking it in reverse visits every child before its parent
+        for layer in reversed(layers.values()):
+            parent = layers.get(layer.parent_id) if layer.parent_id else None
+            if parent is not None:
+                parent.subtree_parameters += layer.subtree_parameters
+
+        root = layers[root_id]
+        root.num_parameters = root.subtree_parameters
+        self._total_parameters = root.subtree_parameters
+
+    @staticmethod
+    def _count_parameters(
+        params: Iterable[torch.Tensor], seen_params: set[int]
+    ) -> tuple[int, int]:
+        """Count the elements of a module's own parameters.
+
+        Returns the total and the part not already seen on another module.
+        """
+        total = 0
+        unique = 0
+        for p in params:
+            numel = p.numel()
+            total += numel
+            if id(p) not in seen_params:
+                seen_params.add(id(p))
+                unique += numel
+        return total, unique
+
+    def _build_node_templates(self) -> None:
+        """Pre-build a collapsed graph node for every layer.
+
+        Layer information does not change after parsing, so the graph
+        builder can reuse these instead of constructing nodes on every
+        expand/collapse.
+        """
+        self.node_templates = {
+            layer_id: GraphNode(
+                id=layer.id,
+                label=layer.label,
+                layer_type=layer.layer_type,
+                module_class=layer.module_class,
+                num_parameters=layer.num_parameters,
+                params=layer.params,
+                has_children=len(layer.children) > 0,
+                expanded=False,
+                depth=layer.depth,
+                parent_id=layer.parent_id,
+            )
+            for layer_id, layer in self.layers.items()
+        }
+
+    def _build_descendant_index(self) -> None:
+        """Map every layer to the IDs of all layers nested below it."""
+        layers = self.layers
+        descendants: dict[str, frozenset[str]] = {}
+
+        # Layers are stored in pre-order, so children are indexed first
+        # when walking in reverse
+        for layer_id in reversed(layers):
+            children = layers[layer_id].children
+            nested = set(children)
+            for child_id in children:
+                nested |= descendants.get(child_id, frozenset())
+            descendants[layer_id] = frozenset(nested)
+
+        self.descendants = descendants
+
     def _extract_computation_graph(self) -> None:
         """Extract computation graph using TorchView for shape information."""
         try:
@@ -125,15 +402,33 @@ class ModelParser:
             if sample_input is None:
                 return
 
-            # Use TorchView to get computation graph
+            cache_key = self._shape_cache_key(sample_input)
+            cached_shapes = _SHAPE_CACHE.get(cache_key)
+            if cached_shapes is not None:
+                # Copy so parsers never share (and mutate) the same lists
+                cached_shapes = copy.deepcopy(cached_shapes)
+                layers = self.layers
+                for layer_id, (input_shape, output_shape) in cached_shapes.items():
+                    layer = layers.get(layer_id)
+                    if layer is not None:
+                        layer.input_shape = input_shape
+                        layer.output_shape = output_shape
+                return
+
+            # Only expand as deep as the module hierarchy actually goes
+            max_depth = max(layer.depth for layer in self.layers.values())
+
+            # Use TorchView to get computation graph. Tracing stays eager:
+            # TorchView records ops through module hooks and a tensor
+            # subclass, which a torch.compile'd model would bypass
             graph = draw_graph(
                 self.model,
                 input_data=sample_input,
-                depth=100,  # Get full depth
+                depth=max_depth + 1,
                 device="meta",  # Use meta device to avoid memory
                 expand_nested=True,
                 hide_inner_tensors=True,
-                hide_module_functions=False,
+                hide_module_functions=not self.show_module_functions,
                 show_shapes=True,
             )
 
@@ -142,25 +437,57 @@ class ModelParser:
             # Extract shape information from the graph
             self._extract_shapes_from_graph(graph)
 
+            if len(_SHAPE_CACHE) >= _SHAPE_CACHE_SIZE:
+                # Evict the oldest entry
+                del _SHAPE_CACHE[next(iter(_SHAPE_CACHE))]
+            _SHAPE_CACHE[cache_key] = copy.deepcopy({
+                layer_id: (layer.input_shape, layer.output_shape)
+                for layer_id, layer in self.layers.items()
+                if layer.input_shape is not None or layer.output_shape is not None
+            })
+            # The key contains id(self.model); drop the entry once it is gone
+            weakref.finalize(self.model, _SHAPE_CACHE.pop, cache_key, None)
+
         except Exception:
             # If TorchView fails, we still have the module hierarchy
             pass
 
+    def _shape_cache_key(self, sample_input: torch.Tensor) -> tuple[Any, ...]:
+        """Build a key identifying the model, its layer configuration and input.
+
+        Each module's ``extra_repr()`` covers settings without parameters
+        (stride, kernel size, ``start_dim``, ...) that still change shapes.
+        """
+        return (
+            id(self.model),
+            type(self.model),
+            self.model_name,
+            self.show_module_functions,
+            tuple(
+                (name, type(module), module.extra_repr())
+                for name, module in self.model.named_modules()
+            ),
+            tuple((name, tuple(p.shape)) for name, p in self.model.named_parameters()),
+            tuple(sample_input.shape),
+            sample_input.dtype,
+        )
+
     def _create_sample_input(self) -> Any:
         """Create a sample input tensor for the model."""
-        # Try to infer input shape from first layer
-        for module in self.model.modules():
-            if isinstance(module, torch.nn.Linear):
-                in_features = module.in_features
-                return torch.zeros(1, in_features, device="meta")
-            elif isinstance(module, torch.nn.Conv2d):
-                in_channels = module.in_channels
-                return torch.zeros(1, in_channels, 224, 224, device="meta")
-            elif isinstance(module, torch.nn.Conv1d):
-                in_channels = module.in_channels
-                return torch.zeros(1, in_channels, 128, device="meta")
-            elif isinstance(module, torch.nn.Embedding):
-                return torch.zeros(1, 32, dtype=torch.long, device="meta")
+        # Infer input shape from the first layer seen while building the
+        # hierarchy
+        module = self._first_input_hint
+        if isinstance(module, torch.nn.Linear):
+            in_features = module.in_features
+            return torch.zeros(1, in_features, device="meta")
+        elif isinstance(module, torch.nn.Conv2d):
+            in_channels = module.in_channels
+            return torch.zeros(1, in_channels, 224, 224, device="meta")
+        elif isinstance(module, torch.nn.Conv1d):
+            in_channels = module.in_channels
+            return torch.zeros(1, in_channels, 128, device="meta")
+        elif isinstance(module, torch.nn.Embedding):
+            return torch.zeros(1, 32, dtype=torch.long, device="meta")
 
         # Default fallback
         return None
@@ -170,77 +497,45 @@ class ModelParser:
         # TorchView provides shape information in its nodes
         # We map these back to our layer hierarchy
         try:
+            # Index layers by name so exact matches are a single lookup
+            name_index: dict[str, LayerInfo] = {}
+            for layer in self.layers.values():
+                name_index.setdefault(layer.name, layer)
+
+            # Many torchview nodes share a name; resolve each name once
+            resolved: dict[str, LayerInfo | None] = {}
+
             for node in graph.node_set:
                 if hasattr(node, "name") and hasattr(node, "output_shape"):
-                    # Try to find matching layer
                     node_name = str(node.name)
-                    for layer_id, layer in self.layers.items():
-                        if layer.name in node_name or node_name in layer_id:
-                            if hasattr(node, "input_shape"):
-                                layer.input_shape = node.input_shape
-                            if hasattr(node, "output_shape"):
-                                layer.output_shape = node.output_shape
-                            break
+                    if node_name in resolved:
+                        layer = resolved[node_name]
+                    else:
+                        layer = name_index.get(node_name)
+                        if layer is None:
+                            # Fall back to substring matching
+                            layer = self._match_layer_by_substring(node_name)
+                        resolved[node_name] = layer
+
+                    if layer is not None:
+                        if hasattr(node, "input_shape"):
+                            layer.input_shape = node.input_shape
+                        layer.output_shape = node.output_shape
         except Exception:
             pass
 
+    def _match_layer_by_substring(self, node_name: str) -> LayerInfo | None:
+        """Find the first layer whose name or ID overlaps with a node name."""
+        for layer_id, layer in self.layers.items():
+            if layer.name in node_name or node_name in layer_id:
+                return layer
+        return None
+
     def _get_layer_type(self, module: nn.Module) -> str:
         """Determine the type category of a layer."""
-        class_name = type(module).__name__
-
-        # Map common layer types to categories
-        type_map = {
-            "Linear": "Linear",
-            "Conv1d": "Conv",
-            "Conv2d": "Conv",
-            "Conv3d": "Conv",
-            "ConvTranspose1d": "Conv",
-            "ConvTranspose2d": "Conv",
-            "ConvTranspose3d": "Conv",
-            "BatchNorm1d": "Normalization",
-            "BatchNorm2d": "Normalization",
-            "BatchNorm3d": "Normalization",
-            "LayerNorm": "Normalization",
-            "GroupNorm": "Normalization",
-            "InstanceNorm1d": "Normalization",
-            "InstanceNorm2d": "Normalization",
-            "Dropout": "Dropout",
-            "Dropout2d": "Dropout",
-            "Dropout3d": "Dropout",
-            "ReLU": "Activation",
-            "LeakyReLU": "Activation",
-            "PReLU": "Activation",
-            "ELU": "Activation",
-            "SELU": "Activation",
-            "GELU": "Activation",
-            "Sigmoid": "Activation",
-            "Tanh": "Activation",
-            "Softmax": "Activation",
-            "LogSoftmax": "Activation",
-            "MaxPool1d": "Pooling",
-            "MaxPool2d": "Pooling",
-            "MaxPool3d": "Pooling",
-            "AvgPool1d": "Pooling",
-            "AvgPool2d": "Pooling",
-            "AvgPool3d": "Pooling",
-            "AdaptiveMaxPool1d": "Pooling",
-            "AdaptiveMaxPool2d": "Pooling",
-            "AdaptiveAvgPool1d": "Pooling",
-            "AdaptiveAvgPool2d": "Pooling",
-            "Flatten": "Reshape",
-            "Unflatten": "Reshape",
-            "LSTM": "Recurrent",
-            "GRU": "Recurrent",
-            "RNN": "Recurrent",
-            "Embedding": "Embedding",
-            "MultiheadAttention": "Attention",
-            "Sequential": "Container",
-            "ModuleList": "Container",
-            "ModuleDict": "Container",
-        }
-
-        if class_name in type_map:
-            return type_map[class_name]
+        layer_type = _LAYER_TYPES.get(type(module).__name__)
+        if layer_type is not None:
+            return layer_type
 
         # Check for container types
         if hasattr(module, "children") and list(module.children()):
@@ -250,52 +545,20 @@ class ModelParser:
 
     def _extract_layer_params(self, module: nn.Module) -> dict[str, Any]:
         """Extract relevant parameters from a layer."""
-        params: dict[str, Any] = {}
-        class_name = type(module).__name__
-
-        if isinstance(module, torch.nn.Linear):
-            params["in_features"] = module.in_features
-            params["out_features"] = module.out_features
-            params["bias"] = module.bias is not None
-
-        elif isinstance(module, (torch.nn.Conv1d, torch.nn.Conv2d, torch.nn.Conv3d)):
-            params["in_channels"] = module.in_channels
-            params["out_channels"] = module.out_channels
-            params["kernel_size"] = module.kernel_size
-            params["stride"] = module.stride
-            params["padding"] = module.padding
-            params["bias"] = module.bias is not None
-
-        elif isinstance(
-            module, (torch.nn.BatchNorm1d, torch.nn.BatchNorm2d, torch.nn.BatchNorm3d)
-        ):
-            params["num_features"] = module.num_features
-            params["eps"] = module.eps
-            params["momentum"] = module.momentum
-
-        elif isinstance(module, torch.nn.LayerNorm):
-            params["normalized_shape"] = list(module.normalized_shape)
-            params["eps"] = module.eps
-
-        elif isinstance(module, (torch.nn.Dropout, torch.nn.Dropout2d)):
-            params["p"] = module.p
-
-        elif isinstance(module, torch.nn.Embedding):
-            params["num_embeddings"] = module.num_embeddings
-            params["embedding_dim"] = module.embedding_dim
-
-        elif isinstance(module, torch.nn.MultiheadAttention):
-            params["embed_dim"] = module.embed_dim
-            params["num_heads"] = module.num_heads
-            params["dropout"] = module.dropout
+        module_type = type(module)
+        extractor = _PARAM_EXTRACTORS.get(module_type)
 
-        elif isinstance(module, (torch.nn.LSTM, torch.nn.GRU)):
-            params["input_size"] = module.input_size
-            params["hidden_size"] = module.hidden_size
-            params["num_layers"] = module.num_layers
-            params["bidirectional"] = module.bidirectional
+        if extractor is None:
+            # Subclass of a known layer (or an unknown layer): resolve once
+            # via isinstance and remember the result for this type
+            extractor = _no_params
+            for layer_class, candidate in _PARAM_EXTRACTORS.items():
+                if isinstance(module, layer_class):
+                    extractor = candidate
+                    break
+            _PARAM_EXTRACTORS[module_type] = extractor
 
-        return params
+        return extractor(module)
 
     def get_layer(self, layer_id: str) -> LayerInfo | None:
         """Get a specific layer by ID."""
@@ -303,14 +566,17 @@ class ModelParser:
 
     def get_children(self, layer_id: str) -> list[LayerInfo]:
         """Get the children of a layer."""
-        layer = self.layers.get(layer_id)
+        layers = self.layers
+        layer = layers.get(layer_id)
         if layer is None:
             return []
-        return [self.layers[child_id] for child_id in layer.children if child_id in self.layers]
+        return [layers[child_id] for child_id in layer.children if child_id in layers]
 
     def get_total_parameters(self) -> int:
         """Get total number of parameters in the model."""
-        return sum(p.numel() for p in self.model.parameters())
+        if self._total_parameters is None:
+            self._total_parameters = sum(p.numel() for p in self.model.parameters())
+        return self._total_parameters
 
     def get_model_summary(self) -> dict[str, Any]:
         """Get a summary of the model."""
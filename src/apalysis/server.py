@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import gzip
+import hashlib
+import mimetypes
+import weakref
 import webbrowser
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -22,11 +28,90 @@ if TYPE_CHECKING:
 _current_model: nn.Module | None = None
 _current_model_name: str = "model"
 _current_input_size: list[tuple[int, ...]] | None = None
-_cached_graph_data: dict[str, Any] | None = None
+_current_graph: _GraphCacheEntry | None = None
+_cached_summary_bytes: bytes | None = None
+
+# Recently built graphs, so switching back to a model skips the trace.
+# Entries are evicted when their model is garbage-collected, so a later
+# object reusing the same id() never hits a stale entry.
+GRAPH_CACHE_SIZE = 4
+_graph_cache: OrderedDict[tuple[Any, ...], _GraphCacheEntry] = OrderedDict()
+_current_graph_key: tuple[Any, ...] | None = None
+
+# Serializes graph builds so concurrent first requests build only once.
+# An asyncio.Lock binds to the loop it first waits on, so there is one per
+# running loop (e.g. a second TestClient or a re-run visualize()).
+_build_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class _GraphCacheEntry(NamedTuple):
+    """A built graph in its serialized forms."""
+
+    graph_bytes: bytes
+    graph_columnar_bytes: bytes
+    node_index: dict[str, bytes]
+    graph_etag: str
+    # The trace failed and the bytes describe an error graph
+    failed: bool = False
+
 
 # Path to static files
 STATIC_DIR = Path(__file__).parent / "_static"
 
+# Content-hashed build output that never changes under the same URL
+IMMUTABLE_PREFIX = "_app/immutable/"
+
+# File types that are already compressed and gain nothing from gzip
+_PRECOMPRESSED_SUFFIXES = frozenset(
+    {".png", ".jpg", ".jpeg", ".gif", ".webp", ".woff", ".woff2", ".gz", ".br", ".zip"}
+)
+
+
+class _StaticAsset(NamedTuple):
+    """A frontend file held in memory."""
+
+    content: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    gzip_content: bytes | None = None
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Convert values orjson cannot serialize natively."""
+    # torch.Size and other tuple subclasses
+    if isinstance(obj, tuple):
+        return list(obj)
+    # Tensors and numpy scalars
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson.
+
+    NaN and infinities are written as ``null``.
+    """
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -41,6 +126,7 @@ def create_app() -> FastAPI:
         description="Interactive PyTorch model visualization powered by torchview",
         version="0.2.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Add CORS middleware for development
@@ -54,90 +140,303 @@ def create_app() -> FastAPI:
 
     # API routes
     @app.get("/api/graph")
-    async def get_graph() -> JSONResponse:
-        """Get the torchview graph data."""
-        if _current_model is None:
+    async def get_graph(
+        request: Request, edges: Literal["rows", "columnar"] = "rows"
+    ) -> Response:
+        """Get the torchview graph data.
+
+        With ``edges=columnar`` the edges are sent as parallel ``source``,
+        ``target`` and ``count`` arrays instead of one object per edge.
+        """
+        graph = await _get_or_build_graph()
+        if graph is None:
             raise HTTPException(status_code=404, detail="No model loaded")
 
-        graph_data = _get_or_build_graph()
-        return JSONResponse(content=graph_data)
+        content = graph.graph_bytes
+        etag = graph.graph_etag
+        if edges == "columnar":
+            content = graph.graph_columnar_bytes
+            etag = f'{etag[:-1]}-columnar"'
+
+        # The graph only changes with set_model(), so clients revalidate
+        # and skip the download when they already hold this version
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=content, media_type="application/json", headers=headers
+        )
 
     @app.get("/api/model/summary")
-    async def get_model_summary() -> JSONResponse:
+    async def get_model_summary() -> Response:
         """Get a summary of the model."""
         if _current_model is None:
             raise HTTPException(status_code=404, detail="No model loaded")
 
-        total_params = sum(p.numel() for p in _current_model.parameters())
-        total_layers = sum(1 for _ in _current_model.modules()) - 1  # Exclude root
-
-        return JSONResponse(
-            content={
-                "name": _current_model_name,
-                "class": type(_current_model).__name__,
-                "total_parameters": total_params,
-                "total_layers": total_layers,
-            }
-        )
+        return Response(content=_cached_summary_bytes, media_type="application/json")
 
     @app.get("/api/node/{node_id:path}")
-    async def get_node_details(node_id: str) -> JSONResponse:
+    async def get_node_details(node_id: str) -> Response:
         """Get detailed information about a specific node."""
-        if _current_model is None:
+        graph = await _get_or_build_graph()
+        if graph is None:
             raise HTTPException(status_code=404, detail="No model loaded")
 
-        graph_data = _get_or_build_graph()
-        
-        # Find the node in the graph data
-        for node in graph_data.get("nodes", []):
-            if node.get("id") == node_id:
-                return JSONResponse(content=node)
-
-        raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found")
-
-    # Serve static files if they exist
-    if STATIC_DIR.exists() and any(STATIC_DIR.iterdir()):
-        # Serve index.html for the root path
-        @app.get("/")
-        async def serve_root() -> FileResponse:
-            index_path = STATIC_DIR / "index.html"
-            if index_path.exists():
-                return FileResponse(index_path)
-            raise HTTPException(status_code=404, detail="Frontend not built")
-
-        # Mount static files for other assets
-        app.mount("/", StaticFiles(directory=STATIC_DIR, html=True), name="static")
+        node_bytes = graph.node_index.get(node_id)
+        if node_bytes is None:
+            raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found")
+
+        return Response(content=node_bytes, media_type="application/json")
+
+    # Serve static files from memory if they exist
+    static_routes = _build_static_routes(_get_static_assets())
+    if static_routes:
+
+        @app.api_route("/{path:path}", methods=["GET", "HEAD"])
+        async def serve_static(path: str, request: Request) -> Response:
+            """Serve a frontend file, or a directory's index.html."""
+            asset = static_routes.get(path)
+            if asset is None:
+                raise HTTPException(status_code=404, detail="Not found")
+
+            content = asset.content
+            etag = asset.etag
+            headers = {"Cache-Control": asset.cache_control}
+
+            if asset.gzip_content is not None:
+                headers["Vary"] = "Accept-Encoding"
+                if _accepts_gzip(request.headers.get("accept-encoding")):
+                    content = asset.gzip_content
+                    # Each encoding is a separate representation with its own tag
+                    etag = f'{etag[:-1]}-gzip"'
+                    headers["Content-Encoding"] = "gzip"
+
+            headers["ETag"] = etag
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                headers.pop("Content-Encoding", None)
+                return Response(status_code=304, headers=headers)
+
+            return Response(
+                content=content, media_type=asset.media_type, headers=headers
+            )
 
     return app
 
 
-def _get_or_build_graph() -> dict[str, Any]:
-    """Get cached graph data or build it from torchview."""
-    global _cached_graph_data
+def _load_static_assets(static_dir: Path) -> dict[str, _StaticAsset]:
+    """Read every file of the built frontend into memory, keyed by URL path."""
+    if not static_dir.is_dir():
+        return {}
+
+    assets: dict[str, _StaticAsset] = {}
+    for file_path in static_dir.rglob("*"):
+        if not file_path.is_file():
+            continue
 
-    if _cached_graph_data is not None:
-        return _cached_graph_data
+        url_path = file_path.relative_to(static_dir).as_posix()
+        content = file_path.read_bytes()
+        media_type, _ = mimetypes.guess_type(file_path.name)
+
+        # Hashed build output can be cached forever; everything else
+        # (index.html, version.json, ...) is revalidated with its ETag
+        if url_path.startswith(IMMUTABLE_PREFIX):
+            cache_control = "public, max-age=31536000, immutable"
+        else:
+            cache_control = "no-cache"
+
+        # Compress once up front; keep the result only if it is smaller
+        gzip_content = None
+        if file_path.suffix.lower() not in _PRECOMPRESSED_SUFFIXES:
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                gzip_content = compressed
+
+        assets[url_path] = _StaticAsset(
+            content=content,
+            media_type=media_type or "application/octet-stream",
+            etag=f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+            cache_control=cache_control,
+            gzip_content=gzip_content,
+        )
 
-    if _current_model is None:
-        return {"nodes": [], "edges": [], "subgraphs": {}}
+    return assets
 
-    _cached_graph_data = _build_torchview_graph()
-    return _cached_graph_data
 
+@functools.cache
+def _get_static_assets() -> dict[str, _StaticAsset]:
+    """Load the bundled frontend once per process.
 
-def _build_torchview_graph() -> dict[str, Any]:
+    An empty result means the frontend has not been built.
+    """
+    return _load_static_assets(STATIC_DIR)
+
+
+def _build_static_routes(
+    assets: dict[str, _StaticAsset],
+) -> dict[str, _StaticAsset]:
+    """Map every servable URL path to its asset.
+
+    Each index.html is also registered under its directory, with and
+    without the trailing slash, so a request needs a single lookup.
+    """
+    routes = dict(assets)
+    for url_path, asset in assets.items():
+        if url_path == "index.html" or url_path.endswith("/index.html"):
+            directory = url_path.removesuffix("index.html")
+            routes.setdefault(directory, asset)
+            routes.setdefault(directory.rstrip("/"), asset)
+    return routes
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    """Check whether an Accept-Encoding header allows gzip.
+
+    An explicit ``gzip`` entry takes precedence over ``*``.
+    """
+    if not accept_encoding:
+        return False
+
+    qualities: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "*"):
+            continue
+
+        # "gzip;q=0" explicitly refuses the encoding
+        quality = 1.0
+        key, _, value = params.partition("=")
+        if key.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities.setdefault(name, quality)
+
+    quality = qualities.get("gzip", qualities.get("*", 0.0))
+    return quality > 0
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def _get_or_build_graph() -> _GraphCacheEntry | None:
+    """Get the current model's graph, building it from torchview if needed.
+
+    The model, name and input size are captured before waiting on the
+    build lock and the build runs on them in a worker thread, so the event
+    loop keeps serving other requests and a set_model() while waiting or
+    building cannot mix two models.
+    Returns None when no model is set.
+    """
+    global _current_graph
+
+    if _current_graph is not None:
+        return _current_graph
+
+    key = _current_graph_key
+    model = _current_model
+    model_name = _current_model_name
+    input_size = _current_input_size
+    if model is None or key is None:
+        return None
+
+    async with _get_build_lock():
+        # Another request may have built this graph while this one waited
+        entry = _graph_cache.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(
+                _build_graph_cache, model, model_name, input_size
+            )
+            # Failed traces are not cached, so set_model() can retry them
+            if not entry.failed:
+                _store_graph(key, model, entry)
+
+        # set_model() may have switched models during the build
+        if key == _current_graph_key:
+            _current_graph = entry
+
+    return entry
+
+
+def _get_build_lock() -> asyncio.Lock:
+    """Get the graph build lock for the running event loop."""
+    loop = asyncio.get_running_loop()
+    lock = _build_locks.get(loop)
+    if lock is None:
+        lock = _build_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def _store_graph(
+    key: tuple[Any, ...], model: nn.Module, entry: _GraphCacheEntry
+) -> None:
+    """Add a built graph to the LRU cache, evicting the oldest entries."""
+    _graph_cache[key] = entry
+    while len(_graph_cache) > GRAPH_CACHE_SIZE:
+        _graph_cache.popitem(last=False)
+
+    # The key contains id(model); drop the entry once the model is gone
+    weakref.finalize(model, _graph_cache.pop, key, None)
+
+
+def _build_graph_cache(
+    model: nn.Module,
+    model_name: str,
+    input_size: list[tuple[int, ...]] | None,
+) -> _GraphCacheEntry:
+    """Build the serialized graph forms, node index and ETag for a model.
+
+    Only the serialized forms are kept; the graph data itself is dropped
+    once they are built.
+    """
+    graph_data = _build_torchview_graph(model, model_name, input_size)
+    edges = graph_data["edges"]
+    edge_rows = [
+        {"source": source, "target": target, "count": count}
+        for source, target, count in zip(
+            edges["source"], edges["target"], edges["count"]
+        )
+    ]
+    node_index = {node["id"]: _dumps(node) for node in graph_data["nodes"]}
+    graph_bytes = _dumps({**graph_data, "edges": edge_rows})
+    etag = f'"{hashlib.blake2b(graph_bytes, digest_size=16).hexdigest()}"'
+    return _GraphCacheEntry(
+        graph_bytes, _dumps(graph_data), node_index, etag, "error" in graph_data
+    )
+
+
+def _empty_graph_data() -> dict[str, Any]:
+    """Graph data for when there is nothing to show."""
+    return {
+        "nodes": [],
+        "edges": {"source": [], "target": [], "count": []},
+        "subgraphs": {},
+    }
+
+
+def _build_torchview_graph(
+    model: nn.Module,
+    model_name: str,
+    input_size: list[tuple[int, ...]] | None,
+) -> dict[str, Any]:
     """Build graph data from the model using torchview."""
     from torchview import draw_graph
 
-    if _current_model is None:
-        return {"nodes": [], "edges": [], "subgraphs": {}}
-
     # Use provided input size or try to infer it
-    input_size = _current_input_size
     if input_size is None:
         # Try to get input size from first parameter shape
         try:
-            first_param = next(_current_model.parameters())
+            first_param = next(model.parameters())
             if first_param.dim() >= 2:
                 input_size = [(1, first_param.shape[1])]
             else:
@@ -148,9 +447,9 @@ def _build_torchview_graph() -> dict[str, Any]:
     # Generate the computation graph using torchview
     try:
         graph = draw_graph(
-            _current_model,
+            model,
             input_size=input_size,
-            graph_name=_current_model_name,
+            graph_name=model_name,
             depth=float("inf"),
             graph_dir="LR",
             expand_nested=True,
@@ -168,68 +467,55 @@ def _build_torchview_graph() -> dict[str, Any]:
         import traceback
         traceback.print_exc()
         print(f"Warning: torchview graph generation failed: {e}")
-        return {"nodes": [], "edges": [], "subgraphs": {}, "error": str(e)}
-
-
-def _sanitize_value(v: Any) -> Any:
-    """Sanitize a value for JSON serialization."""
-    if isinstance(v, float):
-        if v == float("inf"):
-            return "inf"
-        if v == float("-inf"):
-            return "-inf"
-        if v != v:  # NaN check
-            return None
-    if isinstance(v, dict):
-        return {k: _sanitize_value(val) for k, val in v.items()}
-    if isinstance(v, (list, tuple)):
-        return [_sanitize_value(item) for item in v]
-    return v
+        return {**_empty_graph_data(), "error": str(e)}
 
 
 def _networkx_to_json(G) -> dict[str, Any]:
     """Convert NetworkX graph to JSON-serializable format for frontend."""
     # First pass: collect all nodes with their original subgraph assignments
-    raw_nodes = []
+    raw_nodes: list[dict[str, Any]] = []
+    raw_nodes_append = raw_nodes.append
     for node_id, attrs in G.nodes(data=True):
-        if attrs.get("node_type") == "tensor":
-             is_io = attrs.get("is_input", False) or attrs.get("is_output", False)
-             if not is_io:
-                 continue
+        get = attrs.get
+        node_type = get("node_type")
+
+        if node_type == "tensor":
+            is_input = get("is_input", False)
+            is_output = get("is_output", False)
+            if not (is_input or is_output):
+                continue
 
-        node_data = {
+        node = {
             "id": node_id,
-            "name": attrs.get("name", node_id),
-            "nodeType": attrs.get("node_type", "unknown"),
-            "depth": attrs.get("depth", 0),
-            "subgraph": attrs.get("subgraph"),
-            "subgraphLabel": attrs.get("subgraph_label"),
+            "name": get("name", node_id),
+            "nodeType": get("node_type", "unknown"),
+            "depth": get("depth", 0),
+            "subgraph": get("subgraph"),
+            "subgraphLabel": get("subgraph_label"),
         }
-
-        # Add type-specific attributes
-        if attrs.get("node_type") == "tensor":
-            node_data["tensorShape"] = attrs.get("tensor_shape", ())
-            node_data["isInput"] = attrs.get("is_input", False)
-            node_data["isOutput"] = attrs.get("is_output", False)
-            node_data["isAux"] = attrs.get("is_aux", False)
-        elif attrs.get("node_type") in ("module", "function"):
-            node_data["inputShape"] = _serialize_shape(attrs.get("input_shape", []))
-            node_data["outputShape"] = _serialize_shape(attrs.get("output_shape", []))
-            node_data["typeName"] = attrs.get("type_name", "")
-            node_data["isContainer"] = attrs.get("is_container", False)
-
-        raw_nodes.append(node_data)
+        if node_type == "tensor":
+            node["tensorShape"] = get("tensor_shape", ())
+            node["isInput"] = is_input
+            node["isOutput"] = is_output
+            node["isAux"] = get("is_aux", False)
+        elif node_type == "module" or node_type == "function":
+            node["inputShape"] = _serialize_shape(get("input_shape", []))
+            node["outputShape"] = _serialize_shape(get("output_shape", []))
+            node["typeName"] = get("type_name", "")
+            node["isContainer"] = get("is_container", False)
+        raw_nodes_append(node)
 
     # Extract all subgraphs info from torchview
-    all_subgraphs = {}
-    for sg_id, sg_info in G.graph.get("subgraphs", {}).items():
-        all_subgraphs[sg_id] = {
+    all_subgraphs = {
+        sg_id: {
             "label": sg_info.get("label", sg_id),
             "parent": sg_info.get("parent"),
             "moduleName": sg_info.get("module_name", ""),
             "moduleType": sg_info.get("module_type", ""),
             "depth": sg_info.get("depth", 0),
         }
+        for sg_id, sg_info in G.graph.get("subgraphs", {}).items()
+    }
 
     # Filter subgraphs: only keep those with at least 2 children (nodes + child subgraphs)
     # Iterate until no more changes (to handle cascading single-child removals)
@@ -277,34 +563,35 @@ def _networkx_to_json(G) -> dict[str, Any]:
                 del subgraphs[sg_id]
 
     # Update nodes with filtered subgraph assignments
-    nodes = []
     for node_data in raw_nodes:
         node_data["subgraph"] = node_subgraphs.get(node_data["id"])
-        nodes.append(node_data)
 
-    edges = []
+    # Edges are stored columnar: parallel source, target and count lists
+    sources: list[str] = []
+    targets: list[str] = []
+    counts: list[int] = []
     for source, target, attrs in G.edges(data=True):
-        edges.append({
-            "source": source,
-            "target": target,
-            "count": attrs.get("count", 1),
-        })
+        sources.append(source)
+        targets.append(target)
+        counts.append(attrs.get("count", 1))
 
     return {
-        "nodes": nodes,
-        "edges": edges,
+        "nodes": raw_nodes,
+        "edges": {"source": sources, "target": targets, "count": counts},
         "subgraphs": subgraphs,
     }
 
 
-def _serialize_shape(shape: Any) -> list:
-    """Serialize shape data to JSON-compatible format."""
+def _serialize_shape(shape: Any) -> Any:
+    """Normalize shape data to a list.
+
+    Nested torch.Size and tensor values are converted by ``_orjson_default``
+    when the graph is serialized.
+    """
     if shape is None:
         return []
     if isinstance(shape, (list, tuple)):
-        return [_serialize_shape(s) for s in shape]
-    if hasattr(shape, "tolist"):
-        return shape.tolist()
+        return list(shape)
     return shape
 
 
@@ -312,7 +599,7 @@ def set_model(
     model: nn.Module,
     model_name: str = "model",
     input_size: list[tuple[int, ...]] | None = None,
-) -> None:
+) -> dict[str, Any]:
     """
     Set the model to be visualized.
 
@@ -320,13 +607,52 @@ def set_model(
         model: The PyTorch model to visualize
         model_name: The name to display for the root node
         input_size: Optional input size for the model (list of tuples)
+
+    Returns:
+        The model summary served by /api/model/summary
     """
-    global _current_model, _current_model_name, _current_input_size, _cached_graph_data
+    global _current_model, _current_model_name, _current_input_size
+    global _current_graph, _current_graph_key
+    global _cached_summary_bytes
 
     _current_model = model
     _current_model_name = model_name
     _current_input_size = input_size
-    _cached_graph_data = None  # Clear cache when model changes
+
+    # Reuse a previously built graph for this model, if any
+    _current_graph_key = _graph_cache_key(model, model_name, input_size)
+    _current_graph = _graph_cache.get(_current_graph_key)
+    if _current_graph is not None:
+        _graph_cache.move_to_end(_current_graph_key)
+
+    # The summary only depends on the model, so compute it once here
+    summary = {
+        "name": model_name,
+        "class": type(model).__name__,
+        "total_parameters": sum(p.numel() for p in model.parameters()),
+        "total_layers": sum(1 for _ in model.modules()) - 1,  # Exclude root
+    }
+    _cached_summary_bytes = _dumps(summary)
+    return summary
+
+
+def _graph_cache_key(
+    model: nn.Module,
+    model_name: str,
+    input_size: list[tuple[int, ...]] | None,
+) -> tuple[Any, ...]:
+    """Build the graph cache key for a model.
+
+    Besides the model's identity, the key covers its module layout and
+    parameter shapes so that a model modified in place is traced again.
+    """
+    return (
+        id(model),
+        model_name,
+        tuple(tuple(size) for size in input_size or ()),
+        tuple((name, type(module)) for name, module in model.named_modules()),
+        tuple((name, tuple(p.shape)) for name, p in model.named_parameters()),
+    )
 
 
 def visualize(
@@ -361,8 +687,8 @@ def visualize(
         ... )
         >>> apalysis.visualize(model, model_name="MyModel", input_size=[(1, 10)])
     """
-    # Set the model
-    set_model(model, model_name, input_size)
+    # Set the model; the summary also feeds the startup banner
+    summary = set_model(model, model_name, input_size)
 
     # Create the app
     app = create_app()
@@ -371,20 +697,18 @@ def visualize(
     api_url = f"http://{host}:{port}"
     frontend_url = "http://localhost:5173"
 
-    total_params = sum(p.numel() for p in model.parameters())
-
     print(f"\n{'=' * 50}")
     print("  APalysis - Model Visualization (torchview)")
     print(f"{'=' * 50}")
-    print(f"  Model: {model_name} ({type(model).__name__})")
-    print(f"  Parameters: {total_params:,}")
+    print(f"  Model: {summary['name']} ({summary['class']})")
+    print(f"  Parameters: {summary['total_parameters']:,}")
     print(f"  API: {api_url}")
     if dev:
         print(f"  Frontend: {frontend_url}")
         print("  (Run 'pnpm dev' in frontend/ folder)")
     else:
-        has_static = STATIC_DIR.exists() and any(STATIC_DIR.iterdir())
-        if not has_static:
+        # Already loaded by create_app(), so this does not touch the disk
+        if not _get_static_assets():
             print("  Frontend: Not built (run 'pnpm build' in frontend/)")
     print(f"{'=' * 50}")
     print("  Press Ctrl+C to stop the server")
@@ -397,5 +721,7 @@ def visualize(
         else:
             webbrowser.open(api_url)
 
-    # Run the server
+    # Run the server. uvicorn[standard] provides uvloop and httptools, which
+    # uvicorn picks up by default when available on the platform. A single
+    # worker is used because the model lives in this process's memory.
     uvicorn.run(app, host=host, port=port, log_level="warning")
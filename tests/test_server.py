@@ -0,0 +1,96 @@
+"""Tests for the graph cache in apalysis.server."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from apalysis import server
+
+
+class FakeModel:
+    """Just enough of nn.Module for set_model() and the graph cache."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def named_modules(self):
+        return [("", self)]
+
+    def named_parameters(self):
+        return []
+
+    def parameters(self):
+        return iter(())
+
+    def modules(self):
+        return [self]
+
+
+@pytest.fixture
+def builds(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    """Reset the server state and record every graph build."""
+    monkeypatch.setattr(server, "_current_model", None)
+    monkeypatch.setattr(server, "_current_graph", None)
+    monkeypatch.setattr(server, "_current_graph_key", None)
+    monkeypatch.setattr(server, "_graph_cache", OrderedDict())
+
+    calls: list[tuple] = []
+
+    def fake_build(model, model_name, input_size):
+        calls.append((model.name, model_name, input_size))
+        graph = server._empty_graph_data()
+        graph["subgraphs"] = {"owner": {"label": model.name}}
+        return graph
+
+    monkeypatch.setattr(server, "_build_torchview_graph", fake_build)
+    return calls
+
+
+def test_set_model_while_waiting_for_build_lock(builds: list[tuple]) -> None:
+    model_a = FakeModel("A")
+    model_b = FakeModel("B")
+
+    async def scenario() -> None:
+        server.set_model(model_a, "A", [(1, 4)])
+
+        # Hold the lock so the request for A waits while the model changes
+        lock = server._get_build_lock()
+        await lock.acquire()
+        request = asyncio.create_task(server._get_or_build_graph())
+        await asyncio.sleep(0)
+        server.set_model(model_b, "B", [(1, 8)])
+        lock.release()
+
+        entry = await request
+        assert b'"label":"A"' in entry.graph_bytes
+
+        # Switching back serves A's own graph from the cache
+        server.set_model(model_a, "A", [(1, 4)])
+        entry = await server._get_or_build_graph()
+        assert b'"label":"A"' in entry.graph_bytes
+
+    asyncio.run(scenario())
+    assert builds == [("A", "A", [(1, 4)])]
+
+
+def test_failed_build_is_retried_after_set_model(
+    builds: list[tuple], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    model = FakeModel("A")
+
+    def failing_build(model, model_name, input_size):
+        builds.append((model.name, model_name, input_size))
+        return {**server._empty_graph_data(), "error": "trace failed"}
+
+    monkeypatch.setattr(server, "_build_torchview_graph", failing_build)
+    server.set_model(model, "A", [(1, 4)])
+    entry = asyncio.run(server._get_or_build_graph())
+    assert entry.failed
+    assert b"trace failed" in entry.graph_bytes
+
+    server.set_model(model, "A", [(1, 4)])
+    asyncio.run(server._get_or_build_graph())
+    assert len(builds) == 2